@@ -0,0 +1,142 @@
+import os
+import re
+import sys
+import time
+import argparse
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import fitz
+
+from pyPDFCompress import _render_pages_raw, _preprocess_pages, _build_pdf_from_pages, _finalize_pdf
+
+OPEN_RUNS = 20
+
+
+def get_peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def bench_pipeline(input_path, dpi, quality, preprocess=None):
+    tracemalloc.start()
+    try:
+        t0 = time.perf_counter()
+        pages = _render_pages_raw(input_path, dpi)
+        if preprocess:
+            pages = _preprocess_pages(pages, **preprocess)
+        render_s = time.perf_counter() - t0
+        _, render_peak = tracemalloc.get_traced_memory()
+
+        raw_bytes = sum(iw * ih * 3 for iw, ih, _, _ in pages)
+
+        tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        pdf_bytes = _build_pdf_from_pages(pages, quality)
+        build_s = time.perf_counter() - t0
+        _, build_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return pdf_bytes, {
+        "pages": len(pages),
+        "raw_mb": raw_bytes / (1024 * 1024),
+        "render_s": render_s,
+        "build_s": build_s,
+        # Python-level buffer copies held at the peak of each stage, in units
+        # of the raw page size; MuPDF pixmaps and Pillow image memory live
+        # outside the Python allocator and are not counted
+        "render_copies": render_peak / raw_bytes if raw_bytes else 0.0,
+        "build_copies": build_peak / raw_bytes if raw_bytes else 0.0,
+        "output_mb": len(pdf_bytes) / (1024 * 1024),
+    }
+
+
+def bytes_to_first_page(pdf_bytes):
+    # a linearized file declares where the first page's objects end (/E);
+    # anything else has to be fetched whole before the xref can be read
+    match = re.search(rb"/Linearized\s[^>]*?/E\s+(\d+)", pdf_bytes[:1024])
+    if match:
+        return int(match.group(1))
+    return len(pdf_bytes)
+
+
+def open_latency_ms(pdf_bytes):
+    timings = []
+    for _ in range(OPEN_RUNS):
+        t0 = time.perf_counter()
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        doc.load_page(0).get_pixmap(dpi=36)
+        doc.close()
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def bench_finalize(pdf_bytes):
+    t0 = time.perf_counter()
+    final_bytes = _finalize_pdf(pdf_bytes)
+    finalize_s = time.perf_counter() - t0
+
+    doc = fitz.open(stream=final_bytes, filetype="pdf")
+    linearized = bool(doc.is_fast_webaccess)
+    doc.close()
+
+    rows = []
+    for name, data in (("current", pdf_bytes), ("finalized", final_bytes)):
+        rows.append({
+            "name": name,
+            "size_kb": len(data) / 1024,
+            "first_page_kb": bytes_to_first_page(data) / 1024,
+            "open_ms": open_latency_ms(data),
+        })
+    return {"finalize_s": finalize_s, "linearized": linearized, "rows": rows}
+
+
+def print_report(input_path, dpi, quality, stats, finalize_stats):
+    print(f"File: {input_path}")
+    print(f"Settings: {dpi} DPI, JPEG quality {quality}")
+    print(f"Pages: {stats['pages']} ({stats['raw_mb']:.1f} MB raw RGB)")
+    print(f"Render: {stats['render_s']:.3f} s, {stats['render_copies']:.2f} copies per page")
+    print(f"Encode + build: {stats['build_s']:.3f} s, {stats['build_copies']:.2f} copies per page")
+    print(f"Output: {stats['output_mb']:.3f} MB")
+    print(f"Finalize: {finalize_stats['finalize_s']:.3f} s, linearized: {finalize_stats['linearized']}")
+    for row in finalize_stats["rows"]:
+        print(f"  {row['name']:<10} {row['size_kb']:10.1f} KB total, "
+              f"{row['first_page_kb']:10.1f} KB to first page, "
+              f"open + first page {row['open_ms']:.2f} ms")
+    peak_rss = get_peak_rss_mb()
+    if peak_rss is not None:
+        print(f"Peak RSS: {peak_rss:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pyPDFCompress page pipeline.")
+    parser.add_argument("input", help="PDF file to benchmark")
+    parser.add_argument("--dpi", type=int, default=150)
+    parser.add_argument("--quality", type=int, default=75)
+    parser.add_argument("--preprocess", action="store_true",
+                        help="enable background flattening, level normalization and margin cropping")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.input):
+        print(f"Error: The file {args.input} was not found!")
+        return
+
+    preprocess = {"flatten": True, "levels": True, "crop": True} if args.preprocess else None
+    pdf_bytes, stats = bench_pipeline(args.input, args.dpi, args.quality, preprocess)
+    finalize_stats = bench_finalize(pdf_bytes)
+    print_report(args.input, args.dpi, args.quality, stats, finalize_stats)
+
+
+if __name__ == "__main__":
+    main()
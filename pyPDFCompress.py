@@ -3,21 +3,26 @@ import sys
 import shutil
 import threading
 import tempfile
+import hashlib
 from datetime import datetime
 from io import BytesIO
 import concurrent.futures
 
 import fitz
 from PIL import Image
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
 import configparser
 
-import tkinter as tk
-from tkinter import filedialog, messagebox
-from tkinter import ttk
-
 
 def get_program_dir():
     if getattr(sys, 'frozen', False):
@@ -108,6 +113,26 @@ TEXTS = {
 
 CURRENT_LANG = "en"
 
+BLANK_PAGE_POLICIES = ("keep", "drop")
+BLANK_INK_LEVEL = 200
+# ink allowed on a blank page, in square points: a few specks of dust, less
+# than any line of text
+BLANK_MAX_INK_PT2 = 10.0
+
+WHITE_LEVEL = 235
+LEVELS_PERCENTILE = 0.5
+LEVELS_MIN_SPAN = 32
+LUT_BAND_ROWS = 64
+CROP_PADDING = 8
+
+QUALITY_DPI_RANGE = [300, 250, 200, 150, 120, 100, 80, 60]
+QUALITY_FAIL_STREAK = 3
+# every candidate is scored at this DPI: high enough for JPEG artifacts to
+# show, and lower-DPI candidates are scaled up so lost detail counts too
+SSIM_DPI = 150
+SSIM_BLOCK = 8
+SSIM_FLAT_VARIANCE = 4.0
+
 
 def get_config_path():
     return os.path.join(get_program_dir(), "config.ini")
@@ -195,6 +220,49 @@ def save_target_mb_to_ini(value: float):
         pass
 
 
+def load_blank_pages_from_ini(default_value: str = "keep") -> str:
+    try:
+        cfg = configparser.ConfigParser()
+        cfg_path = get_config_path()
+        if not os.path.exists(cfg_path):
+            return default_value
+        cfg.read(cfg_path, encoding="utf-8")
+        val = cfg.get("app", "blank_pages", fallback=default_value).strip().lower()
+        if val in BLANK_PAGE_POLICIES:
+            return val
+        return default_value
+    except Exception:
+        return default_value
+
+
+def load_fast_web_view_from_ini(default_value: bool = True) -> bool:
+    try:
+        cfg = configparser.ConfigParser()
+        cfg_path = get_config_path()
+        if not os.path.exists(cfg_path):
+            return default_value
+        cfg.read(cfg_path, encoding="utf-8")
+        return cfg.getboolean("app", "fast_web_view", fallback=default_value)
+    except Exception:
+        return default_value
+
+
+def load_preprocess_from_ini() -> dict:
+    options = {"flatten": False, "levels": False, "crop": False}
+    try:
+        cfg = configparser.ConfigParser()
+        cfg_path = get_config_path()
+        if not os.path.exists(cfg_path):
+            return options
+        cfg.read(cfg_path, encoding="utf-8")
+        options["flatten"] = cfg.getboolean("app", "flatten_background", fallback=False)
+        options["levels"] = cfg.getboolean("app", "normalize_levels", fallback=False)
+        options["crop"] = cfg.getboolean("app", "crop_margins", fallback=False)
+        return options
+    except Exception:
+        return options
+
+
 def ensure_ini_defaults(default_mb: float = 20.0):
     try:
         cfg = configparser.ConfigParser()
@@ -207,6 +275,13 @@ def ensure_ini_defaults(default_mb: float = 20.0):
             cfg["app"]["language"] = CURRENT_LANG
         if not cfg["app"].get("target_mb"):
             cfg["app"]["target_mb"] = str(default_mb)
+        if not cfg["app"].get("blank_pages"):
+            cfg["app"]["blank_pages"] = BLANK_PAGE_POLICIES[0]
+        for key in ("flatten_background", "normalize_levels", "crop_margins"):
+            if not cfg["app"].get(key):
+                cfg["app"][key] = "false"
+        if not cfg["app"].get("fast_web_view"):
+            cfg["app"]["fast_web_view"] = "true"
         with open(cfg_path, "w", encoding="utf-8") as f:
             cfg.write(f)
     except Exception:
@@ -261,6 +336,7 @@ def open_output_dir(out_dir):
         else:
             os.system(f"xdg-open '{out_dir}'")
     except Exception as e:
+        from tkinter import messagebox
         messagebox.showerror(tr("open_error_title"), tr("open_error_body", e=e))
 
 
@@ -270,49 +346,180 @@ def ensure_base_output_dir():
     return base_dir
 
 
-def _render_pages_raw(input_path, dpi):
+def _is_blank_page(iw, ih, rgb, dpi):
+    img = Image.frombytes("RGB", (iw, ih), rgb).convert("L")
+    try:
+        ink = sum(img.histogram()[:BLANK_INK_LEVEL])
+    finally:
+        img.close()
+    return ink <= BLANK_MAX_INK_PT2 * (dpi / 72.0) ** 2
+
+
+class _PageList(list):
+    """Rendered pages whose buffers are views into MuPDF pixmaps.
+
+    A samples memoryview does not keep its pixmap alive, so the pixmaps are
+    held here for as long as the pages are in use. page_numbers maps each
+    entry back to its source page once blank pages have been dropped.
+    """
+
+    def __init__(self, pages, pixmaps, page_numbers):
+        super().__init__(pages)
+        self.pixmaps = pixmaps
+        self.page_numbers = page_numbers
+
+
+class _JpegReader(ImageReader):
+    """ImageReader over an encoded JPEG buffer.
+
+    reportlab names image XObjects by digesting getRGBData(), which for a
+    plain ImageReader decodes the whole JPEG; for JPEG data the encoded
+    bytes identify the image just as well.
+    """
+
+    def getRGBData(self):
+        # only JPEG data is embedded as is (DCTDecode); anything else is
+        # flate-compressed from real RGB data, so it must be decoded
+        if self.jpeg_fh() is None:
+            return super().getRGBData()
+        self._dataA = None
+        return self.fp.getvalue()
+
+
+def _render_pages_raw(input_path, dpi, blank_pages="keep"):
     doc = fitz.open(input_path)
     pages = []
+    pixmaps = []
     scale = dpi / 72.0
     matrix = fitz.Matrix(scale, scale)
     try:
         for page_num in range(len(doc)):
             page = doc[page_num]
             pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
-            pages.append((pix.width, pix.height, bytes(pix.samples)))
+            # frame is (full width, full height, x offset, y offset) of the
+            # buffer inside the rendered page; margin cropping shrinks it
+            frame = (pix.width, pix.height, 0, 0)
+            pixmaps.append(pix)
+            pages.append((pix.width, pix.height, pix.samples_mv, frame))
     finally:
         doc.close()
-    return pages
-
-
-def _build_pdf_from_pages(pages_raw, jpeg_quality):
-    pdf_buf = BytesIO()
-    c = canvas.Canvas(pdf_buf, pagesize=A4)
-    width, height = A4
-
+    page_numbers = list(range(len(pages)))
+    if blank_pages == "drop":
+        kept = [n for n, p in enumerate(pages) if not _is_blank_page(*p[:3], dpi)]
+        # an all-blank document still needs one page to be a valid PDF
+        page_numbers = kept or page_numbers[:1]
+        pages = [pages[n] for n in page_numbers]
+    return _PageList(pages, pixmaps, page_numbers)
+
+
+def _preprocess_page(iw, ih, rgb, frame, flatten=False, levels=False, crop=False):
+    # rgb is a writable view of the pixmap; flattening and levels are applied in place
+    arr = np.frombuffer(rgb, dtype=np.uint8).reshape(ih, iw, 3)
+
+    if levels:
+        # one luminance range for all channels, so colour scans keep their
+        # balance; nearly uniform pages (blank, sparse) are left alone
+        sample = arr[::8, ::8].astype(np.float32)
+        luma = sample[:, :, 0] * 0.299 + sample[:, :, 1] * 0.587 + sample[:, :, 2] * 0.114
+        lo = float(np.percentile(luma, LEVELS_PERCENTILE))
+        hi = float(np.percentile(luma, 100 - LEVELS_PERCENTILE))
+        if hi - lo >= LEVELS_MIN_SPAN:
+            ramp = np.arange(256, dtype=np.float32)
+            lut = np.clip((ramp - lo) * (255.0 / (hi - lo)), 0, 255).round().astype(np.uint8)
+            # LUT lookups index through intp, so go in bands of rows to keep
+            # the temporaries a small fraction of the page
+            for top in range(0, ih, LUT_BAND_ROWS):
+                band = arr[top:top + LUT_BAND_ROWS]
+                np.take(lut, band, out=band, mode="clip")
+
+    if not (flatten or crop):
+        return iw, ih, rgb, frame
+
+    background = arr.min(axis=2) >= WHITE_LEVEL
+    if flatten:
+        np.copyto(arr, 255, where=background[..., None])
+
+    if not crop:
+        return iw, ih, rgb, frame
+
+    rows = np.flatnonzero(~background.all(axis=1))
+    cols = np.flatnonzero(~background.all(axis=0))
+    if rows.size == 0 or cols.size == 0:
+        return iw, ih, rgb, frame
+
+    top = max(0, int(rows[0]) - CROP_PADDING)
+    bottom = min(ih, int(rows[-1]) + 1 + CROP_PADDING)
+    left = max(0, int(cols[0]) - CROP_PADDING)
+    right = min(iw, int(cols[-1]) + 1 + CROP_PADDING)
+    if (top, bottom, left, right) == (0, ih, 0, iw):
+        return iw, ih, rgb, frame
+
+    fw, fh, fx, fy = frame
+    cropped = np.ascontiguousarray(arr[top:bottom, left:right])
+    return right - left, bottom - top, cropped.data, (fw, fh, fx + left, fy + top)
+
+
+def _preprocess_pages(pages_raw, flatten=False, levels=False, crop=False):
+    if np is None or not (flatten or levels or crop):
+        return pages_raw
+    for i, (iw, ih, rgb, frame) in enumerate(pages_raw):
+        pages_raw[i] = _preprocess_page(iw, ih, rgb, frame, flatten, levels, crop)
+    return pages_raw
+
+
+def _dedupe_pages(pages_raw):
+    unique = {}
+    page_refs = []
+    for iw, ih, rgb, frame in pages_raw:
+        key = (iw, ih, frame, hashlib.blake2b(rgb, digest_size=16).digest())
+        if key not in unique:
+            unique[key] = (len(unique), iw, ih, rgb)
+        page_refs.append((unique[key][0], frame))
+    return list(unique.values()), page_refs
+
+
+def _encode_pages(pages_raw, jpeg_quality):
     max_workers = max(1, min(4, (os.cpu_count() or 1)))
 
     def encode(idx, iw, ih, rgb):
+        # Pillow stores RGB as 4 bytes per pixel, so this unpack is the only
+        # copy of the page buffer; the JPEG buffer is handed on as is
         img = Image.frombytes("RGB", (iw, ih), rgb)
         buf = BytesIO()
         img.save(buf, format="JPEG", quality=jpeg_quality, optimize=True)
-        data = buf.getvalue()
-        buf.close()
         img.close()
-        return (idx, iw, ih, data)
+        buf.seek(0)
+        return (idx, iw, ih, buf)
+
+    # pixel-identical pages are JPEG-encoded only once; reportlab would share
+    # their image XObject anyway, so this saves encode time, not output bytes
+    unique_pages, page_refs = _dedupe_pages(pages_raw)
 
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-        futures = [ex.submit(encode, i, iw, ih, rgb) for i, (iw, ih, rgb) in enumerate(pages_raw)]
+        futures = [ex.submit(encode, i, iw, ih, rgb) for i, iw, ih, rgb in unique_pages]
         results = [f.result() for f in concurrent.futures.as_completed(futures)]
         results.sort(key=lambda t: t[0])
 
-    for idx, iw, ih, jpeg_bytes in results:
-        img_buf = BytesIO(jpeg_bytes)
-        scale = min(width / iw, height / ih)
-        nw, nh = iw * scale, ih * scale
-        x, y = (width - nw) / 2, (height - nh) / 2
-        c.drawImage(ImageReader(img_buf), x, y, width=nw, height=nh)
+    return results, page_refs
+
+
+def _assemble_pdf(results, page_refs):
+    pdf_buf = BytesIO()
+    c = canvas.Canvas(pdf_buf, pagesize=A4)
+    width, height = A4
+
+    img_bufs = [jpeg_buf for _, _, _, jpeg_buf in results]
+    readers = [_JpegReader(img_buf) for img_buf in img_bufs]
+
+    for ref, (fw, fh, fx, fy) in page_refs:
+        _, iw, ih, _ = results[ref]
+        scale = min(width / fw, height / fh)
+        x = (width - fw * scale) / 2 + fx * scale
+        y = (height - fh * scale) / 2 + (fh - fy - ih) * scale
+        c.drawImage(readers[ref], x, y, width=iw * scale, height=ih * scale)
         c.showPage()
+
+    for img_buf in img_bufs:
         img_buf.close()
 
     c.save()
@@ -321,7 +528,141 @@ def _build_pdf_from_pages(pages_raw, jpeg_quality):
     return pdf_bytes
 
 
-def compress_to_target(input_path, output_path, target_mb, progress_cb=None):
+def _build_pdf_from_pages(pages_raw, jpeg_quality):
+    results, page_refs = _encode_pages(pages_raw, jpeg_quality)
+    return _assemble_pdf(results, page_refs)
+
+
+def _verify_pdf(pdf_bytes, page_count, linearized):
+    try:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    except Exception:
+        return False
+    try:
+        if doc.page_count != page_count:
+            return False
+        if linearized and not doc.is_fast_webaccess:
+            return False
+        doc.load_page(0).get_text("text")
+        return True
+    except Exception:
+        return False
+    finally:
+        doc.close()
+
+
+def _finalize_pdf(pdf_bytes, max_bytes=None):
+    # rewrite the reportlab output with compressed object streams and an xref
+    # stream; qpdf (through pikepdf) also linearizes it for fast first-page
+    # display, MuPDF no longer can
+    try:
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        page_count = doc.page_count
+        if pikepdf is None:
+            final = doc.tobytes(garbage=3, deflate=True, use_objstms=1)
+        doc.close()
+        if pikepdf is not None:
+            out = BytesIO()
+            with pikepdf.open(BytesIO(pdf_bytes)) as pdf:
+                pdf.save(out, linearize=True, compress_streams=True,
+                         object_stream_mode=pikepdf.ObjectStreamMode.generate)
+            final = out.getvalue()
+            out.close()
+    except Exception:
+        return pdf_bytes
+
+    if not _verify_pdf(final, page_count, pikepdf is not None):
+        return pdf_bytes
+    if max_bytes is not None and len(final) > max_bytes and len(pdf_bytes) <= max_bytes:
+        return pdf_bytes
+    return final
+
+
+def _render_reference(input_path):
+    # rendered at the top DPI and reduced with the same gray conversion and
+    # filter as the candidates; MuPDF's own gray and low-DPI renders differ
+    doc = fitz.open(input_path)
+    refs = []
+    scale = QUALITY_DPI_RANGE[0] / 72.0
+    matrix = fitz.Matrix(scale, scale)
+    try:
+        for page in doc:
+            pix = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+            size = (max(1, round(pix.width * SSIM_DPI / QUALITY_DPI_RANGE[0])),
+                    max(1, round(pix.height * SSIM_DPI / QUALITY_DPI_RANGE[0])))
+            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples_mv)
+            small = img.convert("L").resize(size, Image.BILINEAR)
+            img.close()
+            refs.append(np.asarray(small, dtype=np.float32))
+    finally:
+        doc.close()
+    return refs
+
+
+def _decode_for_ssim(jpeg_buf, iw, ih, frame, ref_shape):
+    # decoded at full size: libjpeg's reduced-scale draft decode filters
+    # differently from the reference and swamps the JPEG artifacts
+    rh, rw = ref_shape
+    fw, fh, fx, fy = frame
+    jpeg_buf.seek(0)
+    img = Image.open(jpeg_buf)
+    try:
+        gray = img.convert("L")
+    finally:
+        img.close()
+        jpeg_buf.seek(0)
+    if (iw, ih) != (fw, fh):
+        # a cropped page goes back onto a full-resolution white sheet at its
+        # original position before resizing, so it lines up with the reference
+        sheet = Image.new("L", (fw, fh), 255)
+        sheet.paste(gray, (fx, fy))
+        gray = sheet
+    if gray.size != (rw, rh):
+        gray = gray.resize((rw, rh), Image.BILINEAR)
+    return np.asarray(gray, dtype=np.float32)
+
+
+def _ssim(a, b):
+    # mean SSIM of candidate a against reference b over non-overlapping
+    # blocks; blocks flat in the reference (page background) are left out so
+    # that text and line art decide the score, on the same blocks every attempt
+    bh = a.shape[0] // SSIM_BLOCK * SSIM_BLOCK
+    bw = a.shape[1] // SSIM_BLOCK * SSIM_BLOCK
+    shape = (bh // SSIM_BLOCK, SSIM_BLOCK, bw // SSIM_BLOCK, SSIM_BLOCK)
+    a = a[:bh, :bw].reshape(shape)
+    b = b[:bh, :bw].reshape(shape)
+
+    mu_a = a.mean(axis=(1, 3))
+    mu_b = b.mean(axis=(1, 3))
+    var_a = a.var(axis=(1, 3))
+    var_b = b.var(axis=(1, 3))
+    cov = (a * b).mean(axis=(1, 3)) - mu_a * mu_b
+
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    ssim_map = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / \
+               ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+
+    content = var_b > SSIM_FLAT_VARIANCE
+    if content.any():
+        return float(ssim_map[content].mean())
+    return float(ssim_map.mean())
+
+
+def _min_page_ssim(results, page_refs, page_numbers, refs):
+    scores = {}
+    for (ref, frame), page_num in zip(page_refs, page_numbers):
+        if (ref, page_num) in scores:
+            continue
+        _, iw, ih, jpeg_buf = results[ref]
+        reference = refs[page_num]
+        candidate = _decode_for_ssim(jpeg_buf, iw, ih, frame, reference.shape)
+        scores[(ref, page_num)] = _ssim(candidate, reference)
+    return min(scores.values())
+
+
+def compress_to_target(input_path, output_path, target_mb, progress_cb=None, blank_pages="keep",
+                       preprocess=None, fast_web_view=True):
     current_mb = os.path.getsize(input_path) / (1024 * 1024)
     compression_ratio = target_mb / current_mb if current_mb > 0 else 1.0
 
@@ -365,7 +706,9 @@ def compress_to_target(input_path, output_path, target_mb, progress_cb=None):
     try:
         for dpi in dpi_range:
             try:
-                pages_raw = _render_pages_raw(input_path, dpi)
+                pages_raw = _render_pages_raw(input_path, dpi, blank_pages)
+                if preprocess:
+                    pages_raw = _preprocess_pages(pages_raw, **preprocess)
             except Exception:
                 continue
 
@@ -405,6 +748,9 @@ def compress_to_target(input_path, output_path, target_mb, progress_cb=None):
                     q_low = q_mid + 1
 
             if candidate_pdf is not None:
+                if fast_web_view:
+                    candidate_pdf = _finalize_pdf(candidate_pdf, target_bytes)
+                    candidate_size = len(candidate_pdf) / (1024 * 1024)
                 try:
                     write_temp(candidate_pdf)
                     os.replace(temp_path, output_path)
@@ -414,6 +760,9 @@ def compress_to_target(input_path, output_path, target_mb, progress_cb=None):
                 return True, candidate_size if candidate_size is not None else (best_size if best_size != float("inf") else 0.0)
 
         if best_pdf_bytes is not None:
+            if fast_web_view:
+                best_pdf_bytes = _finalize_pdf(best_pdf_bytes, len(best_pdf_bytes))
+                best_size = len(best_pdf_bytes) / (1024 * 1024)
             try:
                 write_temp(best_pdf_bytes)
                 os.replace(temp_path, output_path)
@@ -427,6 +776,111 @@ def compress_to_target(input_path, output_path, target_mb, progress_cb=None):
         return False, 0.0
 
 
+def compress_to_quality(input_path, output_path, min_ssim=0.95, progress_cb=None, blank_pages="keep",
+                        preprocess=None, fast_web_view=True):
+    """Write the smallest output whose every page keeps SSIM >= min_ssim.
+
+    Returns (ok, size_mb, settings); settings holds the chosen dpi, quality
+    and ssim along with every attempt of the search. When the source itself
+    is no larger than the best candidate it is copied instead, and settings
+    has source=True with dpi and quality set to None.
+    """
+    attempts = []
+    if np is None:
+        return False, 0.0, {"attempts": attempts}
+
+    try:
+        refs = _render_reference(input_path)
+    except Exception:
+        return False, 0.0, {"attempts": attempts}
+
+    best_pdf_bytes = None
+    best_settings = None
+
+    bin_steps = 6
+    total_attempts = len(QUALITY_DPI_RANGE) * bin_steps
+    attempt_idx = 0
+    failed_dpis = 0
+
+    try:
+        for dpi in QUALITY_DPI_RANGE:
+            try:
+                pages_raw = _render_pages_raw(input_path, dpi, blank_pages)
+                if preprocess:
+                    pages_raw = _preprocess_pages(pages_raw, **preprocess)
+            except Exception:
+                continue
+
+            q_low, q_high = 40, 95
+
+            for _ in range(bin_steps):
+                if q_low > q_high:
+                    break
+                attempt_idx += 1
+                q_mid = (q_low + q_high) // 2
+
+                if callable(progress_cb):
+                    try:
+                        progress_cb(attempt_idx, total_attempts)
+                    except Exception:
+                        pass
+
+                try:
+                    results, page_refs = _encode_pages(pages_raw, q_mid)
+                    score = _min_page_ssim(results, page_refs, pages_raw.page_numbers, refs)
+                except Exception:
+                    q_high = q_mid - 1
+                    continue
+
+                attempt = {"dpi": dpi, "quality": q_mid, "ssim": round(score, 4)}
+                attempts.append(attempt)
+
+                if score < min_ssim:
+                    q_low = q_mid + 1
+                    continue
+
+                pdf_bytes = _assemble_pdf(results, page_refs)
+                attempt["size_mb"] = len(pdf_bytes) / (1024 * 1024)
+                if best_pdf_bytes is None or len(pdf_bytes) < len(best_pdf_bytes):
+                    best_pdf_bytes = pdf_bytes
+                    best_settings = dict(attempt)
+                q_high = q_mid - 1
+
+            # the score does not fall steadily with DPI (rescaling to the
+            # SSIM grid favours some ratios), so one failing DPI is not enough
+            # to give up on the lower ones
+            if q_low > 95:
+                failed_dpis += 1
+                if failed_dpis >= QUALITY_FAIL_STREAK:
+                    break
+            else:
+                failed_dpis = 0
+
+        if best_pdf_bytes is None:
+            return False, 0.0, {"attempts": attempts}
+
+        if fast_web_view:
+            best_pdf_bytes = _finalize_pdf(best_pdf_bytes)
+            best_settings["size_mb"] = len(best_pdf_bytes) / (1024 * 1024)
+
+        source_size = os.path.getsize(input_path)
+        if source_size <= len(best_pdf_bytes):
+            # the untouched source is already the smallest file above the floor
+            shutil.copyfile(input_path, output_path)
+            source_mb = source_size / (1024 * 1024)
+            return True, source_mb, {"dpi": None, "quality": None, "ssim": 1.0, "size_mb": source_mb,
+                                     "source": True, "attempts": attempts}
+
+        with open(output_path, "wb") as f:
+            f.write(best_pdf_bytes)
+        best_settings["source"] = False
+        best_settings["attempts"] = attempts
+        return True, best_settings["size_mb"], best_settings
+
+    except Exception:
+        return False, 0.0, {"attempts": attempts}
+
+
 selected_files = []
 busy = False
 
@@ -434,6 +888,12 @@ busy = False
 def main():
     global busy
 
+    # tkinter is only needed by the GUI; service.py and its workers import
+    # this module on Python builds that may not ship Tk
+    import tkinter as tk
+    from tkinter import filedialog, messagebox
+    from tkinter import ttk
+
     root = tk.Tk()
     root.geometry("500x150")
     root.resizable(False, False)
@@ -518,6 +978,10 @@ def main():
         except Exception:
             pass
 
+        blank_pages = load_blank_pages_from_ini()
+        preprocess = load_preprocess_from_ini()
+        fast_web_view = load_fast_web_view_from_ini()
+
         out_dir = build_output_dir()
         total = len(selected_files)
         ok_count = 0
@@ -574,7 +1038,8 @@ def main():
                         ok_count += 1
                         root.after(0, progress.config, {"value": (i / total) * 100})
                     else:
-                        ok, out_size = compress_to_target(src, dst, target, update_progress)
+                        ok, out_size = compress_to_target(src, dst, target, update_progress,
+                                                             blank_pages, preprocess, fast_web_view)
                         if ok:
                             ok_count += 1
                     
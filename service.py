@@ -0,0 +1,281 @@
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import collections
+import multiprocessing
+import concurrent.futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from pyPDFCompress import (
+    compress_to_target,
+    compress_to_quality,
+    is_valid_pdf,
+    load_blank_pages_from_ini,
+    load_fast_web_view_from_ini,
+    load_preprocess_from_ini,
+)
+
+CHUNK_SIZE = 1024 * 1024
+LATENCY_WINDOW = 1000
+
+
+class ServiceMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.invalid = 0
+        self.in_flight = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def job_started(self):
+        with self._lock:
+            self.in_flight += 1
+
+    def job_finished(self, ok, seconds, bytes_in, bytes_out):
+        with self._lock:
+            self.in_flight -= 1
+            if ok:
+                self.completed += 1
+                self._latencies.append(seconds)
+                self.bytes_in += bytes_in
+                self.bytes_out += bytes_out
+            else:
+                self.failed += 1
+
+    def job_rejected(self):
+        with self._lock:
+            self.rejected += 1
+
+    def upload_invalid(self):
+        with self._lock:
+            self.invalid += 1
+
+    def snapshot(self):
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            latencies = sorted(self._latencies)
+            data = {
+                "uptime_s": round(uptime, 3),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "invalid": self.invalid,
+                "in_flight": self.in_flight,
+                "throughput_jobs_per_s": round(self.completed / uptime, 4) if uptime > 0 else 0.0,
+                "throughput_mb_in_per_s": round(self.bytes_in / (1024 * 1024) / uptime, 4) if uptime > 0 else 0.0,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+            }
+        for name, pct in (("p50", 50), ("p90", 90), ("p99", 99)):
+            data[f"latency_{name}_s"] = round(_percentile(latencies, pct), 4) if latencies else None
+        return data
+
+
+def _percentile(sorted_values, pct):
+    # nearest-rank percentile over an already sorted list
+    idx = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def _run_job(input_path, output_path, target_mb, min_ssim, blank_pages, preprocess, fast_web_view):
+    if min_ssim is not None:
+        return compress_to_quality(input_path, output_path, min_ssim, None, blank_pages, preprocess,
+                                   fast_web_view)
+    if os.path.getsize(input_path) <= target_mb * 1024 * 1024:
+        shutil.copyfile(input_path, output_path)
+        return True, os.path.getsize(output_path) / (1024 * 1024), None
+    ok, size_mb = compress_to_target(input_path, output_path, target_mb, None, blank_pages, preprocess,
+                                     fast_web_view)
+    if ok and os.path.getsize(output_path) > os.path.getsize(input_path):
+        # rasterizing grew the file (e.g. vector input); the source is smaller
+        shutil.copyfile(input_path, output_path)
+        return True, os.path.getsize(output_path) / (1024 * 1024), {"source": True}
+    return ok, size_mb, None
+
+
+class CompressionHandler(BaseHTTPRequestHandler):
+    server_version = "pyPDFCompress"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/metrics":
+            self.send_json(200, self.server.metrics.snapshot())
+        elif path == "/health":
+            self.send_json(200, {"status": "ok"})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/compress":
+            self.send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+            if length <= 0:
+                raise ValueError
+        except ValueError:
+            self.send_json(411, {"error": "a PDF body with Content-Length is required"})
+            return
+
+        query = parse_qs(url.query)
+        target_mb = None
+        min_ssim = None
+        try:
+            if "min_ssim" in query:
+                min_ssim = float(query["min_ssim"][0])
+                if not 0 < min_ssim <= 1:
+                    raise ValueError
+            else:
+                target_mb = float(query.get("target_mb", [""])[0])
+                if target_mb <= 0:
+                    raise ValueError
+        except ValueError:
+            self.discard_body(length)
+            self.send_json(400, {"error": "give target_mb greater than zero or min_ssim between 0 and 1"})
+            return
+
+        # backpressure: refuse instead of queueing without bound
+        if not self.server.slots.acquire(blocking=False):
+            self.server.metrics.job_rejected()
+            self.discard_body(length)
+            self.send_json(503, {"error": "server busy"}, {"Retry-After": "1"})
+            return
+
+        started = None
+        ok = False
+        bytes_out = 0
+        try:
+            with tempfile.TemporaryDirectory(prefix="pypdfcompress-") as work_dir:
+                input_path = os.path.join(work_dir, "input.pdf")
+                output_path = os.path.join(work_dir, "output.pdf")
+                self.receive_body(input_path, length)
+
+                # client errors are counted apart from failed jobs
+                if not is_valid_pdf(input_path):
+                    self.server.metrics.upload_invalid()
+                    self.send_json(400, {"error": "body is not a valid PDF"})
+                    return
+
+                self.server.metrics.job_started()
+                started = time.monotonic()
+                future = self.server.pool.submit(
+                    _run_job, input_path, output_path, target_mb, min_ssim,
+                    self.server.blank_pages, self.server.preprocess, self.server.fast_web_view,
+                )
+                try:
+                    ok, size_mb, settings = future.result()
+                except Exception:
+                    ok = False
+                if not ok:
+                    self.send_json(500, {"error": "compression failed"})
+                    return
+
+                bytes_out = os.path.getsize(output_path)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(bytes_out))
+                self.send_header("X-Output-MB", f"{size_mb:.4f}")
+                if settings and settings.get("source"):
+                    self.send_header("X-Source-Copy", "1")
+                elif settings:
+                    self.send_header("X-DPI", str(settings["dpi"]))
+                    self.send_header("X-JPEG-Quality", str(settings["quality"]))
+                    self.send_header("X-SSIM", str(settings["ssim"]))
+                self.end_headers()
+                with open(output_path, "rb") as f:
+                    shutil.copyfileobj(f, self.wfile, CHUNK_SIZE)
+        finally:
+            if started is not None:
+                self.server.metrics.job_finished(ok, time.monotonic() - started, length, bytes_out)
+            self.server.slots.release()
+
+    def discard_body(self, length):
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    def receive_body(self, path, length):
+        remaining = length
+        with open(path, "wb") as f:
+            while remaining > 0:
+                chunk = self.rfile.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise ConnectionError("upload ended early")
+                f.write(chunk)
+                remaining -= len(chunk)
+
+
+class CompressionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, queue_size=8, quiet=False):
+        super().__init__(address, CompressionHandler)
+        workers = workers or max(1, min(4, (os.cpu_count() or 1)))
+        # workers are submitted to from handler threads; forking a threaded
+        # process can leave locks held in the child, so spawn them instead
+        self.pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        # running jobs plus those waiting for a worker
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.metrics = ServiceMetrics()
+        self.blank_pages = load_blank_pages_from_ini()
+        self.preprocess = load_preprocess_from_ini()
+        self.fast_web_view = load_fast_web_view_from_ini()
+        self.quiet = quiet
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP PDF compression service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="compression processes")
+    parser.add_argument("--queue-size", type=int, default=8,
+                        help="jobs allowed to wait for a worker before requests are refused")
+    parser.add_argument("--quiet", action="store_true", help="do not log requests")
+    args = parser.parse_args()
+
+    server = CompressionServer((args.host, args.port), args.workers, args.queue_size, args.quiet)
+    print(f"Listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()